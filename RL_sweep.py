@@ -0,0 +1,416 @@
+"""
+RL_sweep.py
+
+Module Description:
+This module implements a hyperparameter sweep for the Q-learning agent defined in RL_train.py.
+It expands a grid or random search space over gamma, epsilon, decay_rate and num_episodes into trials,
+runs the trials concurrently on a process pool with a separate seed per trial, stops weak trials early
+using the win rate and reward of periodic greedy evaluation episodes, and writes the results to a CSV table.
+"""
+
+import csv
+import itertools
+import os
+import random
+import statistics
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Manager
+
+import numpy as np
+from HexOthello import ThreePlayerOthello
+from RL_train import OthelloQLearningAgent
+
+SWEEP_PARAMETERS = ("gamma", "epsilon", "decay_rate", "num_episodes")
+DEFAULT_PARAMETERS = {"gamma": 0.9, "epsilon": 1.0, "decay_rate": 0.99, "num_episodes": 1000}
+RESULT_COLUMNS = ["trial", "seed", "gamma", "epsilon", "decay_rate", "num_episodes", "status", "episodes_run",
+                  "stopped_early", "eval_win_rate", "eval_avg_reward", "train_win_rate", "train_rolling_win_rate",
+                  "train_rolling_avg_reward", "final_epsilon", "elapsed_seconds", "error"]
+STATUS_RANK = {"finished": 2, "stopped early": 1, "failed": 0}
+
+def grid_trials(search_space):
+    """
+    Expands a grid search space into the list of every parameter combination.
+
+    Parameters:
+        search_space (dict): Maps parameter names to lists of candidate values. Parameters that are
+            not given fall back to the defaults of train_rl_agent.
+
+    Returns:
+        list[dict]: One parameter dictionary per trial.
+    """
+    _check_search_space(search_space)
+    names = list(search_space)
+    trials = []
+    for values in itertools.product(*(search_space[name] for name in names)):
+        params = dict(DEFAULT_PARAMETERS)
+        params.update(zip(names, values))
+        trials.append(params)
+    return trials
+
+def random_trials(search_space, num_trials, seed=0):
+    """
+    Samples trials from a random search space.
+
+    Parameters:
+        search_space (dict): Maps parameter names to either a list of candidate values, which is sampled
+            uniformly, or a (low, high) tuple, which is sampled uniformly from the continuous range.
+            num_episodes ranges are sampled as integers.
+        num_trials (int): The number of trials to sample.
+        seed (int): The seed for the sampler. Defaults to 0.
+
+    Returns:
+        list[dict]: One parameter dictionary per trial.
+    """
+    _check_search_space(search_space)
+    for name, values in search_space.items():
+        if isinstance(values, tuple):
+            if len(values) != 2:
+                raise ValueError(f"Range for {name} must be a (low, high) tuple, got {values}")
+            if values[0] > values[1]:
+                raise ValueError(f"Range for {name} must have low <= high, got {values}")
+    rng = random.Random(seed)
+    trials = []
+    for _ in range(num_trials):
+        params = dict(DEFAULT_PARAMETERS)
+        for name, values in search_space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if name == "num_episodes":
+                    params[name] = rng.randint(int(low), int(high))
+                else:
+                    params[name] = rng.uniform(low, high)
+            else:
+                params[name] = rng.choice(values)
+        trials.append(params)
+    return trials
+
+def _check_search_space(search_space):
+    """
+    Raises a ValueError if the search space names a parameter the trainer does not take.
+
+    Parameters:
+        search_space (dict): The search space to check.
+    """
+    unknown = set(search_space) - set(SWEEP_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}. "
+                         f"Expected some of: {', '.join(SWEEP_PARAMETERS)}")
+
+def evaluate_agent(agent, game, num_episodes):
+    """
+    Measures the learned policy of an agent by playing greedy episodes that do not update the Q-table.
+
+    Parameters:
+        agent (OthelloQLearningAgent): The agent to evaluate.
+        game (ThreePlayerOthello): The game instance to play on.
+        num_episodes (int): The number of evaluation episodes.
+
+    Returns:
+        tuple[float, float]: The win rate and the average reward over the evaluation episodes.
+    """
+    total_reward = 0
+    wins = 0
+    for _ in range(num_episodes):
+        episode_reward, won = agent.play_episode(game, learn=False)
+        total_reward += episode_reward
+        wins += won
+    return wins / num_episodes, total_reward / num_episodes
+
+def _running_value(entry, episode):
+    """
+    Returns the running evaluation statistics of a trial at an episode: its latest report at or before
+    that episode, provided the trial has either ended or already reached that episode.
+
+    Parameters:
+        entry (dict): The checkpoint entry of the trial, with its "reports" and whether it is "done".
+        episode (int): The episode to look up.
+
+    Returns:
+        tuple[float, float]: The (win_rate, avg_reward) of the trial, or None if it has no value at that episode yet.
+    """
+    reported = [report_episode for report_episode in entry["reports"] if report_episode <= episode]
+    if not reported or not (entry["done"] or max(entry["reports"]) >= episode):
+        return None
+    return entry["reports"][max(reported)]
+
+def _report(checkpoints, lock, trial_id, episode, win_rate, avg_reward, done=False):
+    """
+    Records the evaluation statistics of a trial at an episode and returns the running values of the other trials.
+
+    Parameters:
+        checkpoints (dict): Shared mapping from trial id to its checkpoint entry.
+        lock (Lock): Shared lock guarding checkpoints.
+        trial_id (int): The index of the reporting trial.
+        episode (int): The episode the statistics were measured at.
+        win_rate (float): The evaluation win rate of the trial.
+        avg_reward (float): The evaluation average reward of the trial.
+        done (bool): Whether the trial has ended. Defaults to False.
+
+    Returns:
+        list[tuple[float, float]]: The running (win_rate, avg_reward) of every other trial at that episode.
+    """
+    with lock:
+        entry = checkpoints.get(trial_id, {"reports": {}, "done": False})
+        entry["reports"][episode] = (win_rate, avg_reward)
+        entry["done"] = done
+        checkpoints[trial_id] = entry
+        others = [other for other_id, other in checkpoints.items() if other_id != trial_id]
+
+    values = (_running_value(other, episode) for other in others)
+    return [value for value in values if value is not None]
+
+def _should_stop(checkpoints, lock, trial_id, episode, win_rate, avg_reward, min_reports):
+    """
+    Records the evaluation statistics of a trial at a checkpoint and applies the median stopping rule:
+    a trial is stopped when both its evaluation win rate and its evaluation average reward are below the
+    median of the running values of the other trials at that episode. Trials that have ended, whether
+    stopped early or finished, keep counting with their last value, so the bar does not rise as weak trials
+    drop out. Trials that have not reached the episode yet, such as those still queued behind a full worker
+    pool, are not counted, so the outcome depends on max_workers and on the order the trials were submitted in.
+
+    Parameters:
+        checkpoints (dict): Shared mapping from trial id to its checkpoint entry.
+        lock (Lock): Shared lock guarding checkpoints.
+        trial_id (int): The index of the reporting trial.
+        episode (int): The checkpoint episode.
+        win_rate (float): The evaluation win rate of the trial.
+        avg_reward (float): The evaluation average reward of the trial.
+        min_reports (int): The number of other trials that must have a value at the checkpoint before
+            a trial can be stopped.
+
+    Returns:
+        bool: Whether the trial should be stopped.
+    """
+    values = _report(checkpoints, lock, trial_id, episode, win_rate, avg_reward)
+    if len(values) < min_reports:
+        return False
+
+    median_win_rate = statistics.median(value[0] for value in values)
+    median_reward = statistics.median(value[1] for value in values)
+    if win_rate < median_win_rate and avg_reward < median_reward:
+        _report(checkpoints, lock, trial_id, episode, win_rate, avg_reward, done=True)
+        return True
+    return False
+
+def run_trial(trial_id, params, seed, checkpoints, lock, eval_interval=1000, eval_episodes=100, window=1000,
+              min_episodes=5000, min_reports=3, q_table_dir=None):
+    """
+    Trains one agent with the given hyperparameters. Meant to be run in a worker process.
+    The agent is evaluated with evaluate_agent at every early stopping check and once training ends, so that
+    trials are compared on their learned policy rather than on how much their epsilon schedule still explores.
+
+    Parameters:
+        trial_id (int): The index of the trial.
+        params (dict): The values of gamma, epsilon, decay_rate and num_episodes for the trial.
+        seed (int): The seed for the random and numpy.random generators in this process.
+        checkpoints (dict): Shared mapping from trial id to its evaluation reports, used for early stopping.
+        lock (Lock): Shared lock guarding checkpoints.
+        eval_interval (int): The number of episodes between early stopping checks. Defaults to 1000.
+        eval_episodes (int): The number of greedy episodes played at each evaluation. Defaults to 100.
+        window (int): The number of recent training episodes the train_rolling statistics are computed over.
+            Defaults to 1000.
+        min_episodes (int): The number of episodes before a trial can be stopped. Defaults to 5000.
+        min_reports (int): The number of other trials that must have a value at a checkpoint before
+            a trial can be stopped there. Defaults to 3.
+        q_table_dir (str): The directory to save the trial's Q-table in. The Q-table is not saved if None.
+
+    Returns:
+        dict: A row of the results table.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    start_time = time.perf_counter()
+
+    game = ThreePlayerOthello()
+    agent = OthelloQLearningAgent(state_size=13*19, action_size=13*19, epsilon=params["epsilon"],
+                                  decay_rate=params["decay_rate"], gamma=params["gamma"])
+
+    recent_rewards = deque(maxlen=window)
+    recent_wins = deque(maxlen=window)
+    rl_wins = 0
+    stopped_early = False
+    episodes_run = 0
+
+    for episode in range(1, params["num_episodes"] + 1):
+        episode_reward, won = agent.play_episode(game)
+        recent_rewards.append(episode_reward)
+        recent_wins.append(won)
+        rl_wins += won
+        agent.decay_epsilon()
+        episodes_run = episode
+
+        if episode >= min_episodes and episode % eval_interval == 0 and episode < params["num_episodes"]:
+            eval_win_rate, eval_avg_reward = evaluate_agent(agent, game, eval_episodes)
+            if _should_stop(checkpoints, lock, trial_id, episode, eval_win_rate, eval_avg_reward, min_reports):
+                stopped_early = True
+                break
+
+    if not stopped_early:
+        eval_win_rate, eval_avg_reward = evaluate_agent(agent, game, eval_episodes)
+        _report(checkpoints, lock, trial_id, episodes_run, eval_win_rate, eval_avg_reward, done=True)
+
+    if q_table_dir is not None:
+        agent.save_q_table(os.path.join(q_table_dir, f"othello_q_table_trial_{trial_id}.pickle"))
+
+    return {
+        "trial": trial_id,
+        "seed": seed,
+        "gamma": params["gamma"],
+        "epsilon": params["epsilon"],
+        "decay_rate": params["decay_rate"],
+        "num_episodes": params["num_episodes"],
+        "status": "stopped early" if stopped_early else "finished",
+        "episodes_run": episodes_run,
+        "stopped_early": stopped_early,
+        "eval_win_rate": eval_win_rate,
+        "eval_avg_reward": eval_avg_reward,
+        "train_win_rate": rl_wins / max(episodes_run, 1),
+        "train_rolling_win_rate": sum(recent_wins) / max(len(recent_wins), 1),
+        "train_rolling_avg_reward": sum(recent_rewards) / max(len(recent_rewards), 1),
+        "final_epsilon": agent.epsilon,
+        "elapsed_seconds": round(time.perf_counter() - start_time, 2),
+        "error": "",
+    }
+
+def _failed_row(trial_id, params, seed, error):
+    """
+    Builds the results table row of a trial whose worker raised an exception.
+
+    Parameters:
+        trial_id (int): The index of the trial.
+        params (dict): The hyperparameters of the trial.
+        seed (int): The seed of the trial.
+        error (BaseException): The exception raised by the worker.
+
+    Returns:
+        dict: A row of the results table.
+    """
+    row = dict.fromkeys(RESULT_COLUMNS, "")
+    row.update(trial=trial_id, seed=seed, status="failed", error=f"{type(error).__name__}: {error}",
+               **{name: params[name] for name in SWEEP_PARAMETERS})
+    return row
+
+def _rank_key(result):
+    """
+    Returns the sort key of a results table row: finished trials first, then trials stopped early,
+    then failed trials, each group ordered by evaluation win rate and then evaluation average reward.
+
+    Parameters:
+        result (dict): A row of the results table.
+
+    Returns:
+        tuple: The sort key, to be used with reverse=True.
+    """
+    if result["status"] == "failed":
+        return (STATUS_RANK["failed"], float("-inf"), float("-inf"))
+    return (STATUS_RANK[result["status"]], result["eval_win_rate"], result["eval_avg_reward"])
+
+def run_sweep(search_space, search="grid", num_trials=10, seed=0, max_workers=None, eval_interval=1000,
+              eval_episodes=100, window=1000, min_episodes=5000, min_reports=3, results_file="sweep_results.csv", q_table_dir=None):
+    """
+    Runs a hyperparameter sweep over train_rl_agent's parameters on a process pool and writes a results table.
+    Trial i is seeded with seed + i, so a sweep is reproducible for a fixed search space and seed, apart from
+    which trials get stopped early. A trial is only compared against trials that have reached its checkpoint
+    or already ended (see _should_stop), so with more trials than workers the trials in the first batch are
+    judged against fewer and different trials than later ones, and early stopping depends on max_workers,
+    on the submission order and on the relative speed of the workers.
+
+    Each row is appended to results_file as soon as its trial completes, so finished trials are kept if the
+    sweep is interrupted. Trials whose worker raises are recorded with status "failed" and the error message.
+    Once the sweep ends, the file is rewritten sorted with _rank_key. Trials are ranked on their last evaluation,
+    so trials with different num_episodes are ranked against each other as if their training lengths were
+    comparable. The train_* columns are the statistics of the exploring training episodes, kept for reference.
+
+    Parameters:
+        search_space (dict): The search space, see grid_trials and random_trials.
+        search (str): Either "grid" or "random". Defaults to "grid".
+        num_trials (int): The number of trials to sample for a random search. Defaults to 10.
+        seed (int): The base seed for sampling and for the trials. Defaults to 0.
+        max_workers (int): The number of worker processes. Defaults to the number of CPUs.
+        eval_interval (int): The number of episodes between early stopping checks. Defaults to 1000.
+        eval_episodes (int): The number of greedy episodes played at each evaluation. Defaults to 100.
+        window (int): The number of recent training episodes the train_rolling statistics are computed over.
+            Defaults to 1000.
+        min_episodes (int): The number of episodes before a trial can be stopped. Defaults to 5000.
+        min_reports (int): The number of other trials that must have a value at a checkpoint before
+            a trial can be stopped there. Defaults to 3.
+        results_file (str): The CSV file to write the results table to. Defaults to "sweep_results.csv".
+        q_table_dir (str): The directory to save each trial's Q-table in. Q-tables are not saved if None.
+
+    Returns:
+        list[dict]: The rows of the results table, finished trials first, each group by best evaluation win rate.
+    """
+    if search == "grid":
+        trials = grid_trials(search_space)
+    elif search == "random":
+        trials = random_trials(search_space, num_trials, seed=seed)
+    else:
+        raise ValueError(f"Unknown search type: {search}. Expected 'grid' or 'random'")
+    if not trials:
+        raise ValueError("The search space produced no trials")
+
+    if q_table_dir is not None:
+        os.makedirs(q_table_dir, exist_ok=True)
+
+    with open(results_file, "w", newline="") as handle:
+        csv.DictWriter(handle, fieldnames=RESULT_COLUMNS).writeheader()
+
+    results = []
+    try:
+        with Manager() as manager:
+            checkpoints = manager.dict()
+            lock = manager.Lock()
+
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(run_trial, trial_id, params, seed + trial_id, checkpoints, lock,
+                                           eval_interval, eval_episodes, window, min_episodes, min_reports,
+                                           q_table_dir):
+                           (trial_id, params, seed + trial_id)
+                           for trial_id, params in enumerate(trials)}
+
+                try:
+                    for future in as_completed(futures):
+                        try:
+                            result = future.result()
+                        except Exception as error:
+                            result = _failed_row(*futures[future], error)
+                        results.append(result)
+
+                        with open(results_file, "a", newline="") as handle:
+                            csv.DictWriter(handle, fieldnames=RESULT_COLUMNS).writerow(result)
+
+                        if result["status"] == "failed":
+                            print(f"Trial {result['trial']} of {len(trials)} failed: {result['error']}")
+                        else:
+                            print(f"Trial {result['trial']} of {len(trials)} {result['status']} after "
+                                  f"{result['episodes_run']} episodes, "
+                                  f"Eval Win Rate: {result['eval_win_rate'] * 100:.2f}%, "
+                                  f"Eval Avg Reward: {result['eval_avg_reward']:.2f}")
+                except KeyboardInterrupt:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+    finally:
+        results.sort(key=_rank_key, reverse=True)
+        with open(results_file, "w", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=RESULT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(results)
+
+    best = results[0]
+    if best["status"] == "failed":
+        print("Every trial failed")
+    else:
+        print(f"Best trial {best['trial']}: gamma={best['gamma']}, epsilon={best['epsilon']}, "
+              f"decay_rate={best['decay_rate']}, num_episodes={best['num_episodes']}, "
+              f"Eval Win Rate: {best['eval_win_rate'] * 100:.2f}%")
+    return results
+
+if __name__ == "__main__":
+    results = run_sweep({
+        "gamma": [0.8, 0.9, 0.99],
+        "epsilon": [1.0],
+        "decay_rate": [0.9999, 0.99996, 0.99999],
+        "num_episodes": [100000],
+    })
@@ -79,10 +79,27 @@ class OthelloQLearningAgent:
         if np.random.random() < self.epsilon:
             return random.choice(valid_actions)
         else:
-            q_values = self.q_table[state_key].todense().A1
-            valid_q_values = [q_values[action] for action in valid_actions]
-            max_value_index = np.argmax(valid_q_values)
-            return valid_actions[max_value_index]
+            return self.get_greedy_action(state, valid_actions)
+
+    def get_greedy_action(self, state, valid_actions):
+        """
+        Selects the valid action with the highest Q-value, without exploring or adding the state to the Q-table.
+
+        Parameters:
+            state (numpy.ndarray): The current state of the game.
+            valid_actions (list[int]): List of valid actions.
+
+        Returns:
+            int: The selected action.
+        """
+        state_q_values = self.q_table.get(self.get_state_key(state))
+        if state_q_values is None:
+            q_values = np.zeros(self.action_size)
+        else:
+            q_values = state_q_values.todense().A1
+        valid_q_values = [q_values[action] for action in valid_actions]
+        max_value_index = np.argmax(valid_q_values)
+        return valid_actions[max_value_index]
     
     def update(self, state, action, reward, next_state, done):
         """
@@ -145,6 +162,84 @@ class OthelloQLearningAgent:
         with open(filename, 'rb') as handle:
             self.q_table = pickle.load(handle)
 
+    def play_episode(self, game, learn=True):
+        """
+        Plays a single episode against the random player (A) and the greedy player (B).
+        When learning, the agent (C) follows its epsilon-greedy policy and updates the Q-table after every move.
+        Otherwise it always plays its greedy action and leaves the Q-table untouched.
+
+        Parameters:
+            game (ThreePlayerOthello): The game instance to play on. It is reset before the episode starts.
+            learn (bool): Whether to explore and update the Q-table. Defaults to True.
+
+        Returns:
+            tuple[float, bool]: The total reward collected by the agent and whether the agent won the episode.
+        """
+        game.reset()
+        done = False
+        episode_reward = 0
+        
+        while not done:
+            current_player = game.players[game.current_player_index]
+            
+            if current_player == "A ":  
+                moves = game.valid_moves("A ")
+                if moves:
+                    move = random.choice(moves)
+                    game.make_move(move[0], move[1], "A ")
+
+            elif current_player == "B ":
+                moves = game.valid_moves("B ")
+                
+                if moves:
+                    best_move = None
+                    max_flips = -1
+                    
+                    for move in moves:
+                        r, c = move
+                        temp_board = [row[:] for row in game.board]
+                        game.make_move(r, c, "B ")
+                        
+                        flipped_pieces = sum(row.count("B ") for row in game.board) - sum(row.count("B ") for row in temp_board)
+                        
+                        game.board = temp_board 
+                        
+                        if flipped_pieces > max_flips:
+                            max_flips = flipped_pieces
+                            best_move = move
+                    
+                    if best_move:
+                        game.make_move(best_move[0], best_move[1], "B ")
+                
+            else:
+                moves = game.valid_moves("C ")
+                if not moves:
+                    game.current_player_index = (game.current_player_index + 1) % 3
+                    continue
+                
+                state = np.array([game.get_numeric_state("C ")])
+                valid_actions = [row * 19 + col for row, col in moves]
+                if learn:
+                    action = self.get_action(state, valid_actions)
+                else:
+                    action = self.get_greedy_action(state, valid_actions)
+                row, col = divmod(action, 19)
+                game.make_move(row, col, "C ")
+                reward = game.get_reward("C ")
+                episode_reward += reward
+                next_state = np.array([game.get_numeric_state("C ")])
+                done = game.game_over()
+                if learn:
+                    self.update(state, action, reward, next_state, done)
+            
+            game.current_player_index = (game.current_player_index + 1) % 3
+
+            if game.game_over():
+                done = True
+
+        disk_counts = game.count_disks()
+        return episode_reward, disk_counts["C "] == max(disk_counts.values())
+
     def train_rl_agent(num_episodes=1000, gamma=0.9, epsilon=1.0, decay_rate=0.99):
         """
         Trains the Q-learning agent through multiple episodes. The agent plays against random player and greedy player.
@@ -167,67 +262,10 @@ class OthelloQLearningAgent:
         rl_wins = 0
         
         for episode in range(num_episodes):
-            game.reset()
-            done = False
-            episode_reward = 0
-            
-            while not done:
-                current_player = game.players[game.current_player_index]
-                
-                if current_player == "A ":  
-                    moves = game.valid_moves("A ")
-                    if moves:
-                        move = random.choice(moves)
-                        game.make_move(move[0], move[1], "A ")
-
-                elif current_player == "B ":
-                    moves = game.valid_moves("B ")
-                    
-                    if moves:
-                        best_move = None
-                        max_flips = -1
-                        
-                        for move in moves:
-                            r, c = move
-                            temp_board = [row[:] for row in game.board]
-                            game.make_move(r, c, "B ")
-                            
-                            flipped_pieces = sum(row.count("B ") for row in game.board) - sum(row.count("B ") for row in temp_board)
-                            
-                            game.board = temp_board 
-                            
-                            if flipped_pieces > max_flips:
-                                max_flips = flipped_pieces
-                                best_move = move
-                        
-                        if best_move:
-                            game.make_move(best_move[0], best_move[1], "B ")
-                    
-                else:
-                    moves = game.valid_moves("C ")
-                    if not moves:
-                        game.current_player_index = (game.current_player_index + 1) % 3
-                        continue
-                    
-                    state = np.array([game.get_numeric_state("C ")])
-                    valid_actions = [row * 19 + col for row, col in moves]
-                    action = agent.get_action(state, valid_actions)
-                    row, col = divmod(action, 19)
-                    game.make_move(row, col, "C ")
-                    reward = game.get_reward("C ")
-                    episode_reward += reward
-                    next_state = np.array([game.get_numeric_state("C ")])
-                    done = game.game_over()
-                    agent.update(state, action, reward, next_state, done)
-                
-                game.current_player_index = (game.current_player_index + 1) % 3
-
-                if game.game_over():
-                    done = True
-            
+            episode_reward, won = agent.play_episode(game)
             total_rewards.append(episode_reward)
 
-            if game.count_disks()["C "] == max(game.count_disks().values()):
+            if won:
                 rl_wins += 1
 
             agent.decay_epsilon()
@@ -0,0 +1,140 @@
+"""
+test_RL_sweep.py
+
+Module Description:
+Tests for the hyperparameter sweep in RL_sweep.py and the training episode it runs from RL_train.py.
+"""
+
+import csv
+import random
+import threading
+
+import numpy as np
+import pytest
+from HexOthello import ThreePlayerOthello
+from RL_sweep import DEFAULT_PARAMETERS, _should_stop, evaluate_agent, grid_trials, random_trials, run_sweep
+from RL_train import OthelloQLearningAgent
+
+def test_grid_trials_fills_defaults():
+    trials = grid_trials({"gamma": [0.8, 0.9], "decay_rate": [0.99, 0.999]})
+
+    assert len(trials) == 4
+    assert {(trial["gamma"], trial["decay_rate"]) for trial in trials} == {
+        (0.8, 0.99), (0.8, 0.999), (0.9, 0.99), (0.9, 0.999)}
+    for trial in trials:
+        assert trial["epsilon"] == DEFAULT_PARAMETERS["epsilon"]
+        assert trial["num_episodes"] == DEFAULT_PARAMETERS["num_episodes"]
+
+def test_unknown_parameters_are_rejected():
+    with pytest.raises(ValueError):
+        grid_trials({"alpha": [0.1]})
+    with pytest.raises(ValueError):
+        random_trials({"alpha": (0.1, 0.2)}, num_trials=1)
+
+def test_random_trials_are_reproducible():
+    search_space = {"gamma": (0.8, 0.99), "decay_rate": [0.999, 0.9999], "num_episodes": (1e4, 1e5)}
+
+    trials = random_trials(search_space, num_trials=5, seed=7)
+
+    assert trials == random_trials(search_space, num_trials=5, seed=7)
+    for trial in trials:
+        assert 0.8 <= trial["gamma"] <= 0.99
+        assert trial["decay_rate"] in (0.999, 0.9999)
+        assert isinstance(trial["num_episodes"], int)
+        assert 10000 <= trial["num_episodes"] <= 100000
+        assert trial["epsilon"] == DEFAULT_PARAMETERS["epsilon"]
+
+def test_random_trials_rejects_bad_ranges():
+    with pytest.raises(ValueError):
+        random_trials({"gamma": (0.99, 0.8)}, num_trials=1)
+    with pytest.raises(ValueError):
+        random_trials({"gamma": (0.8, 0.9, 0.99)}, num_trials=1)
+
+def test_should_stop_waits_for_min_reports():
+    checkpoints, lock = {}, threading.Lock()
+
+    for trial_id in range(3):
+        assert not _should_stop(checkpoints, lock, trial_id, 5000, 0.5, 1.0, min_reports=3)
+    assert not _should_stop(checkpoints, lock, 3, 5000, 0.0, 0.0, min_reports=5)
+    assert len(checkpoints) == 4
+
+def test_should_stop_needs_both_stats_below_median():
+    checkpoints, lock = {}, threading.Lock()
+    for trial_id, (win_rate, avg_reward) in enumerate([(0.4, 1.0), (0.5, 2.0), (0.6, 3.0)]):
+        _should_stop(checkpoints, lock, trial_id, 5000, win_rate, avg_reward, min_reports=3)
+
+    assert not _should_stop(checkpoints, lock, 3, 5000, 0.1, 5.0, min_reports=3)
+    assert not _should_stop(checkpoints, lock, 4, 5000, 0.9, 0.0, min_reports=3)
+    assert not _should_stop(checkpoints, lock, 5, 6000, 0.1, 0.0, min_reports=3)
+    assert _should_stop(checkpoints, lock, 6, 5000, 0.1, 0.0, min_reports=3)
+    assert checkpoints[6]["done"]
+
+def test_should_stop_counts_ended_trials_at_later_checkpoints():
+    checkpoints, lock = {}, threading.Lock()
+    for trial_id, (win_rate, avg_reward) in enumerate([(0.1, 0.0), (0.2, 1.0), (0.3, 2.0)]):
+        _should_stop(checkpoints, lock, trial_id, 5000, win_rate, avg_reward, min_reports=3)
+    for trial_id in range(3):
+        checkpoints[trial_id]["done"] = True
+
+    assert not _should_stop(checkpoints, lock, 3, 6000, 0.25, 1.5, min_reports=3)
+    assert _should_stop(checkpoints, lock, 4, 6000, 0.15, 0.5, min_reports=3)
+
+def test_play_episode_finishes_the_game():
+    random.seed(0)
+    np.random.seed(0)
+    game = ThreePlayerOthello()
+    agent = OthelloQLearningAgent(state_size=13*19, action_size=13*19)
+    make_move = game.make_move
+    agent_moves = []
+
+    def record_move(r, c, player):
+        if player == "C ":
+            agent_moves.append((r, c))
+        return make_move(r, c, player)
+
+    game.make_move = record_move
+    episode_reward, won = agent.play_episode(game)
+
+    disk_counts = game.count_disks()
+    assert game.game_over()
+    assert won == (disk_counts["C "] == max(disk_counts.values()))
+    assert agent_moves
+    assert sum(updates.sum() for updates in agent.num_updates.values()) == len(agent_moves)
+
+def test_evaluation_does_not_change_the_agent():
+    random.seed(0)
+    np.random.seed(0)
+    game = ThreePlayerOthello()
+    agent = OthelloQLearningAgent(state_size=13*19, action_size=13*19, epsilon=0.5)
+    for _ in range(3):
+        agent.play_episode(game)
+    q_table = {key: value.copy() for key, value in agent.q_table.items()}
+    num_updates = {key: value.copy() for key, value in agent.num_updates.items()}
+
+    win_rate, avg_reward = evaluate_agent(agent, game, num_episodes=3)
+
+    assert 0.0 <= win_rate <= 1.0
+    assert agent.epsilon == 0.5
+    assert agent.q_table.keys() == q_table.keys()
+    for key, value in q_table.items():
+        assert (agent.q_table[key] != value).nnz == 0
+        assert (agent.num_updates[key] == num_updates[key]).all()
+
+def test_run_sweep_rejects_empty_search():
+    with pytest.raises(ValueError):
+        run_sweep({"gamma": []})
+    with pytest.raises(ValueError):
+        run_sweep({"gamma": (0.8, 0.9)}, search="random", num_trials=0)
+
+def test_run_sweep_records_failed_trials(tmp_path):
+    results_file = tmp_path / "sweep_results.csv"
+
+    results = run_sweep({"num_episodes": [2, "bad"]}, max_workers=2, eval_episodes=2,
+                        results_file=str(results_file))
+
+    assert [result["status"] for result in results] == ["finished", "failed"]
+    assert results[1]["error"].startswith("TypeError")
+    with open(results_file, newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["trial"] for row in rows] == [str(results[0]["trial"]), str(results[1]["trial"])]
+    assert [row["status"] for row in rows] == ["finished", "failed"]